@@ -4,34 +4,201 @@ DuckDB Federated Query Engine HTTP Client
 Provides a Python interface for executing queries against the DuckDB FQE
 """
 
-import requests
+import asyncio
+import gzip
+import httpx
+import io
+import itertools
 import json
+import re
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 import pandas as pd
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+ARROW_STREAM_MIME = "application/vnd.apache.arrow.stream"
+
+# Responses that mean the server rejected the Arrow format itself, as opposed
+# to the query failing
+_ARROW_REJECTED_STATUSES = (406, 415)
+_ARROW_REJECTED_RE = re.compile(r'\b(unknown|unsupported|invalid)\s+(output\s+)?format\b', re.IGNORECASE)
+
+# Response encodings accepted from the server; httpx decodes both
+ACCEPT_ENCODING = "gzip, zstd"
+
+# Request bodies larger than this are gzipped when compress_requests is set
+COMPRESS_MIN_BYTES = 4096
+
+# Maximum number of distinct queries execute_prepared tracks (LRU eviction)
+PREPARED_MAXSIZE = 256
+
+# Backoff bounds (seconds) used while waiting for the service to come up
+READY_INITIAL_DELAY = 0.1
+READY_MAX_DELAY = 2.0
+
+
+CONNECTION_INFO_QUERY = (
+    "SELECT version() AS version, "
+    "(SELECT list(database_name) FROM duckdb_databases() WHERE NOT internal) AS databases"
+)
+
+
+def _first_row(result: Any) -> Optional[List[Any]]:
+    """Return the first row of a query result as a list of values, if any"""
+    if isinstance(result, list) and len(result) > 0:
+        return list(result[0].values())
+    elif isinstance(result, dict) and result.get('data'):
+        return list(result['data'][0])
+    return None
+
+
+# Statements whose results must not be cached and which invalidate the cache
+_WRITE_RE = re.compile(r'^\s*(INSERT|UPDATE|DELETE|CREATE|DROP|ALTER|ATTACH|DETACH|USE|COPY)\b',
+                       re.IGNORECASE)
+
+# Table identifiers accepted by describe_table/count_rows: [database.][schema.]table,
+# where each part is a bare name or a double-quoted identifier ("" escapes a quote)
+_IDENT_PART = r'(?:[A-Za-z_]\w*|"(?:[^"]|"")+")'
+_IDENT_RE = re.compile(rf'^{_IDENT_PART}(?:\.{_IDENT_PART}){{0,2}}$')
+
+# Error raised by DuckDB when EXECUTE names a statement this connection lacks
+_STMT_NOT_FOUND_RE = re.compile(r'prepared statement .*(does not exist|not found)', re.IGNORECASE)
+
+_MISSING = object()
+
+
+class _TTLCache:
+    """Bounded LRU cache whose entries also expire after a fixed TTL"""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        """Return the cached value for key, or _MISSING if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expiry, value = entry
+        if time.monotonic() >= expiry:
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _canonical_table_name(table_name: str) -> str:
+    """Strip surrounding whitespace and validate a table identifier"""
+    name = table_name.strip()
+    if not _IDENT_RE.match(name):
+        raise ValueError(f"Invalid table name: {table_name!r}")
+    return name
+
+
+@lru_cache(maxsize=256)
+def _describe_sql(table_name: str) -> str:
+    return f"DESCRIBE {_canonical_table_name(table_name)}"
+
+
+@lru_cache(maxsize=256)
+def _count_sql(table_name: str) -> str:
+    return f"SELECT COUNT(*) as count FROM {_canonical_table_name(table_name)}"
+
+
+def _encode_body(payload: Dict[str, Any], compress: bool) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize a JSON payload, gzipping it when compression is on and it is large"""
+    body = _json_dumps(payload)
+    if compress and len(body) > COMPRESS_MIN_BYTES:
+        return gzip.compress(body), {"Content-Encoding": "gzip"}
+    return body, {}
+
+
+def _cache_key(query: str, params: Optional[Dict[str, Any]]) -> Any:
+    return (query, json.dumps(params, sort_keys=True, default=str) if params else None)
+
 
 class DuckDBFQEClient:
     """Client for interacting with DuckDB Federated Query Engine via HTTP API"""
 
-    def __init__(self, base_url: str = "http://localhost:8080", timeout: int = 30):
+    def __init__(self, base_url: str = "http://localhost:8080", timeout: int = 30,
+                 cache_ttl: float = 60, cache_maxsize: int = 256,
+                 compress_requests: bool = False,
+                 transport: Optional[httpx.BaseTransport] = None):
         """
         Initialize the DuckDB FQE client
 
         Args:
             base_url: Base URL of the DuckDB HTTP server
             timeout: Request timeout in seconds
+            cache_ttl: Lifetime in seconds of cached metadata/query results
+            cache_maxsize: Maximum number of cached results kept (LRU eviction)
+            compress_requests: Gzip large request bodies (the server must
+                accept Content-Encoding: gzip)
+            transport: Optional httpx transport, e.g. httpx.MockTransport in tests;
+                also used by execute_queries if it supports async requests
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
-        self.session = requests.Session()
+        self.compress_requests = compress_requests
+        self._cache = _TTLCache(cache_ttl, cache_maxsize)
+        self._arrow_supported = True
+        self._batch_supported = True
+        self._prepared: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._prepare_supported = True
+        self._stmt_ids = itertools.count()
+        self._transport = transport
+
+        # Background event loop and async client used by execute_queries,
+        # created on first use and kept so fan-outs share one connection pool
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._async_client: Optional["AsyncDuckDBFQEClient"] = None
+        self._loop_lock = threading.Lock()
+
+        # HTTP/2 lets concurrent queries share one connection as streams
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            headers={"Content-Type": "application/json", "Accept-Encoding": ACCEPT_ENCODING},
+            transport=transport
+        )
 
     def is_healthy(self) -> bool:
         """Check if the DuckDB service is healthy and responsive"""
         try:
-            response = self.session.get(f"{self.base_url}/health", timeout=5)
+            response = self.client.get("/health", timeout=5)
             return response.status_code == 200
-        except requests.exceptions.RequestException:
+        except httpx.HTTPError:
             return False
 
     def wait_for_ready(self, max_wait: int = 60) -> bool:
@@ -44,20 +211,34 @@ class DuckDBFQEClient:
         Returns:
             True if service becomes ready, False if timeout
         """
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
+        deadline = time.monotonic() + max_wait
+        delay = READY_INITIAL_DELAY
+        while True:
             if self.is_healthy():
                 return True
-            time.sleep(2)
-        return False
-
-    def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # Exponential backoff so a service that comes up quickly is seen quickly
+            time.sleep(min(delay, remaining))
+            delay = min(READY_MAX_DELAY, delay * 2)
+
+    def _post_query(self, payload: Dict[str, Any], params: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """POST a JSON payload to the query endpoint, gzipping large bodies if enabled"""
+        body, encoding_headers = _encode_body(payload, self.compress_requests)
+        headers = {**(headers or {}), **encoding_headers}
+        return self.client.post("/query", content=body, params=params, headers=headers)
+
+    def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = False) -> Dict[str, Any]:
         """
         Execute a SQL query
 
         Args:
             query: SQL query to execute
             params: Optional query parameters
+            use_cache: Serve repeated read-only queries from the TTL cache
 
         Returns:
             Query results as dictionary
@@ -65,26 +246,205 @@ class DuckDBFQEClient:
         Raises:
             Exception: If query execution fails
         """
+        is_write = _WRITE_RE.match(query) is not None
+        key = None
+        if use_cache and not is_write:
+            key = _cache_key(query, params)
+            cached = self._cache.get(key)
+            if cached is not _MISSING:
+                # Raw response bytes are cached so every caller gets its own copy
+                return _json_loads(cached)
+
         payload = {"query": query}
         if params:
             payload["params"] = params
 
         try:
-            response = self.session.post(
-                f"{self.base_url}/query",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout
-            )
+            response = self._post_query(payload)
 
             if response.status_code == 200:
-                return response.json()
+                result = _json_loads(response.content)
+                if key is not None:
+                    self._cache.set(key, response.content)
+                elif is_write:
+                    self._cache.clear()
+                return result
             else:
                 raise Exception(f"Query failed with status {response.status_code}: {response.text}")
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
+            raise Exception(f"Request failed: {e}")
+
+    def execute_queries(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Execute several independent SQL queries concurrently
+
+        The queries run on an AsyncDuckDBFQEClient owned by a background event
+        loop thread, which is reused across calls so its connection pool stays
+        warm. The call blocks until all results are in; when made from inside
+        a running event loop (notebooks, async applications) that loop's thread
+        is blocked too, so async code should use AsyncDuckDBFQEClient directly.
+
+        Args:
+            queries: SQL queries to execute
+
+        Returns:
+            Query results, in the same order as the queries
+        """
+        client = self._get_async_client()
+        return self._run_in_loop(client.execute_queries(queries))
+
+    def _get_async_client(self) -> "AsyncDuckDBFQEClient":
+        """Start the background event loop and its async client on first use"""
+        with self._loop_lock:
+            if self._async_client is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="duckdb-fqe-async", daemon=True
+                )
+                self._loop_thread.start()
+
+                transport = self._transport
+                if not isinstance(transport, httpx.AsyncBaseTransport):
+                    transport = None
+                client = AsyncDuckDBFQEClient(self.base_url, self.timeout,
+                                              compress_requests=self.compress_requests,
+                                              transport=transport)
+                self._run_in_loop(client.__aenter__())
+                self._async_client = client
+            return self._async_client
+
+    def _run_in_loop(self, coro):
+        """Run a coroutine on the background event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def execute_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Execute several read-only SQL statements in a single HTTP round trip
+
+        The statements are sent as one multi-statement request (with a
+        "multi_statement" flag) and the server must answer with a "results"
+        list holding one result set per statement. The DuckDB httpserver
+        extension deployed by this repo's Dockerfile does not implement this,
+        so against it the first batch raises and later batches fail fast
+        without being sent; use execute_queries there instead.
+
+        Args:
+            queries: Read-only SQL statements, without trailing semicolons
+
+        Returns:
+            Query results, in the same order as the queries
+
+        Raises:
+            ValueError: If any statement writes or changes the schema
+            Exception: If query execution fails or the server cannot batch
+        """
+        writes = [q for q in queries if _WRITE_RE.match(q)]
+        if writes:
+            raise ValueError(f"execute_batch only accepts read-only statements, got: {writes[0]!r}")
+        if not self._batch_supported:
+            raise Exception("Server does not support multi-statement result sets")
+
+        payload = {"query": "; ".join(queries), "multi_statement": 1}
+
+        try:
+            response = self._post_query(payload)
+        except httpx.HTTPError as e:
             raise Exception(f"Request failed: {e}")
 
+        if response.status_code != 200:
+            raise Exception(f"Query failed with status {response.status_code}: {response.text}")
+
+        result = _json_loads(response.content)
+        results = result.get("results") if isinstance(result, dict) else None
+        if isinstance(results, list) and len(results) == len(queries):
+            return results
+
+        self._batch_supported = False
+        raise Exception("Server does not support multi-statement result sets")
+
+    def _prepare(self, query: str, stmt_id: Optional[str] = None) -> str:
+        """Prepare a query server-side and return its statement name"""
+        if stmt_id is None:
+            stmt_id = f"fqe_stmt_{next(self._stmt_ids)}"
+        self.execute_query(f"PREPARE {stmt_id} AS {query}")
+        self._remember_prepared(query, stmt_id)
+        return stmt_id
+
+    def _remember_prepared(self, query: str, stmt_id: Optional[str]) -> None:
+        """Track a query's statement name, evicting the least recently used one"""
+        self._prepared[query] = stmt_id
+        self._prepared.move_to_end(query)
+        while len(self._prepared) > PREPARED_MAXSIZE:
+            _, evicted = self._prepared.popitem(last=False)
+            if evicted is not None:
+                try:
+                    self.execute_query(f"DEALLOCATE {evicted}")
+                except Exception:
+                    pass
+
+    def _stop_preparing(self, query: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Give up on prepared statements for this client and run the query directly"""
+        self._prepare_supported = False
+        self._prepared.clear()
+        return self.execute_query(query, params)
+
+    def execute_prepared(self, query: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute a query through a cached server-side prepared statement
+
+        A query is run directly the first time it is seen and prepared once it
+        repeats, so later calls reuse the plan DuckDB built. If the server
+        rejects PREPARE or does not keep prepared statements between requests
+        (e.g. each request gets its own connection), the client stops preparing
+        and runs queries directly from then on.
+
+        Args:
+            query: SQL query to execute
+            params: Optional query parameters bound on EXECUTE
+
+        Returns:
+            Query results as dictionary
+
+        Raises:
+            Exception: If query execution fails
+        """
+        if not self._prepare_supported:
+            return self.execute_query(query, params)
+
+        if query not in self._prepared:
+            self._remember_prepared(query, None)
+            return self.execute_query(query, params)
+
+        self._prepared.move_to_end(query)
+        stmt_id = self._prepared[query]
+        if stmt_id is None:
+            try:
+                stmt_id = self._prepare(query)
+            except Exception:
+                # The query itself already ran, so the server refuses PREPARE
+                return self._stop_preparing(query, params)
+
+        try:
+            return self.execute_query(f"EXECUTE {stmt_id}", params)
+        except Exception as e:
+            if not _STMT_NOT_FOUND_RE.search(str(e)):
+                raise
+
+        # The statement is gone (e.g. server restart); prepare it again once
+        try:
+            self._prepare(query, stmt_id)
+        except Exception:
+            return self._stop_preparing(query, params)
+        try:
+            return self.execute_query(f"EXECUTE {stmt_id}", params)
+        except Exception as e:
+            if not _STMT_NOT_FOUND_RE.search(str(e)):
+                raise
+
+        # Statements do not survive between requests on this server
+        return self._stop_preparing(query, params)
+
     def execute_query_to_dataframe(self, query: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
         """
         Execute a query and return results as a pandas DataFrame
@@ -96,10 +456,19 @@ class DuckDBFQEClient:
         Returns:
             Query results as pandas DataFrame
         """
-        result = self.execute_query(query, params)
+        result = None
+        # Writes always go through execute_query so they invalidate the cache
+        if pa is not None and self._arrow_supported and not _WRITE_RE.match(query):
+            result = self._execute_query_arrow(query, params)
+            if isinstance(result, pd.DataFrame):
+                return result
+        if result is None:
+            result = self.execute_query(query, params)
 
         # Assuming the result format includes 'data' and 'columns'
         if 'data' in result and 'columns' in result:
+            if not result['data']:
+                return pd.DataFrame(columns=result['columns'])
             return pd.DataFrame(result['data'], columns=result['columns'])
         elif isinstance(result, list):
             return pd.DataFrame(result)
@@ -107,9 +476,48 @@ class DuckDBFQEClient:
             # Try to convert the result directly
             return pd.DataFrame([result])
 
+    def _execute_query_arrow(self, query: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Request a query result as an Arrow IPC stream and decode it columnar
+
+        Returns:
+            Query results as pandas DataFrame; the decoded JSON result if the
+            server answered with JSON instead; None if it rejected the format
+
+        Raises:
+            Exception: If query execution fails
+        """
+        # The httpserver picks the output format from the default_format URL parameter
+        payload = {"query": query}
+        if params:
+            payload["params"] = params
+
+        try:
+            response = self._post_query(
+                payload,
+                params={"default_format": "ArrowStream"},
+                headers={"Accept": ARROW_STREAM_MIME}
+            )
+        except httpx.HTTPError as e:
+            raise Exception(f"Request failed: {e}")
+
+        if response.status_code != 200:
+            if (response.status_code in _ARROW_REJECTED_STATUSES
+                    or _ARROW_REJECTED_RE.search(response.text)):
+                # Server does not understand the Arrow format; stop asking for it
+                self._arrow_supported = False
+                return None
+            raise Exception(f"Query failed with status {response.status_code}: {response.text}")
+        if not response.headers.get("Content-Type", "").startswith(ARROW_STREAM_MIME):
+            self._arrow_supported = False
+            return _json_loads(response.content)
+
+        table = pa.ipc.open_stream(io.BytesIO(response.content)).read_all()
+        return table.to_pandas(self_destruct=True)
+
     def get_databases(self) -> List[Dict[str, str]]:
         """Get list of attached databases"""
-        result = self.execute_query("SHOW DATABASES")
+        result = self.execute_query("SHOW DATABASES", use_cache=True)
         return result
 
     def get_tables(self, database: Optional[str] = None) -> List[Dict[str, str]]:
@@ -127,7 +535,7 @@ class DuckDBFQEClient:
         else:
             query = "SELECT * FROM federated_tables"
 
-        return self.execute_query(query)
+        return self.execute_query(query, use_cache=True)
 
     def describe_table(self, table_name: str) -> List[Dict[str, Any]]:
         """
@@ -138,9 +546,12 @@ class DuckDBFQEClient:
 
         Returns:
             Table schema information
+
+        Raises:
+            ValueError: If table_name is not a [database.][schema.]table identifier
+                made of bare or double-quoted names
         """
-        query = f"DESCRIBE {table_name}"
-        return self.execute_query(query)
+        return self.execute_query(_describe_sql(table_name), use_cache=True)
 
     def count_rows(self, table_name: str) -> int:
         """
@@ -151,9 +562,12 @@ class DuckDBFQEClient:
 
         Returns:
             Number of rows
+
+        Raises:
+            ValueError: If table_name is not a [database.][schema.]table identifier
+                made of bare or double-quoted names
         """
-        query = f"SELECT COUNT(*) as count FROM {table_name}"
-        result = self.execute_query(query)
+        result = self.execute_prepared(_count_sql(table_name))
 
         # Extract count from result
         if isinstance(result, list) and len(result) > 0:
@@ -180,6 +594,29 @@ class DuckDBFQEClient:
         Returns:
             Query results
         """
+        query = self.build_federated_join_query(tables, join_conditions, select_columns,
+                                                where_conditions, limit)
+        return self.execute_query(query)
+
+    @staticmethod
+    def build_federated_join_query(tables: List[str], join_conditions: List[str],
+                                   select_columns: List[str] = None,
+                                   where_conditions: List[str] = None,
+                                   limit: Optional[int] = None) -> str:
+        """
+        Build the SQL for a federated join without executing it, e.g. to send
+        several joins together through execute_batch
+
+        Args:
+            tables: List of table names to join
+            join_conditions: List of JOIN conditions
+            select_columns: Columns to select (default: *)
+            where_conditions: Optional WHERE conditions
+            limit: Optional LIMIT clause
+
+        Returns:
+            SQL query string
+        """
         # Build SELECT clause
         if select_columns:
             select_clause = ", ".join(select_columns)
@@ -203,9 +640,7 @@ class DuckDBFQEClient:
             limit_clause = f" LIMIT {limit}"
 
         # Construct final query
-        query = f"SELECT {select_clause} FROM {from_clause}{where_clause}{limit_clause}"
-
-        return self.execute_query(query)
+        return f"SELECT {select_clause} FROM {from_clause}{where_clause}{limit_clause}"
 
     def get_connection_info(self) -> Dict[str, Any]:
         """Get information about the DuckDB connection and attached databases"""
@@ -217,22 +652,30 @@ class DuckDBFQEClient:
         }
 
         try:
-            # Get DuckDB version
-            version_result = self.execute_query("SELECT version()")
-            if version_result:
-                info["version"] = version_result
-
-            # Get attached databases
-            info["databases"] = self.get_databases()
+            # Fetch version and attached databases in a single round trip
+            row = _first_row(self.execute_query(CONNECTION_INFO_QUERY))
+            if row:
+                info["version"], info["databases"] = row
 
         except Exception as e:
             info["error"] = str(e)
 
         return info
 
+    def invalidate_metadata(self):
+        """Drop cached metadata and query results, e.g. after out-of-band DDL"""
+        self._cache.clear()
+
     def close(self):
-        """Close the HTTP session"""
-        self.session.close()
+        """Close the HTTP client and stop the background event loop, if started"""
+        self.client.close()
+        with self._loop_lock:
+            if self._loop is not None:
+                self._run_in_loop(self._async_client.close())
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop_thread.join()
+                self._loop.close()
+                self._loop = self._loop_thread = self._async_client = None
 
     def __enter__(self):
         """Context manager entry"""
@@ -243,6 +686,180 @@ class DuckDBFQEClient:
         self.close()
 
 
+class AsyncDuckDBFQEClient:
+    """Asynchronous client for the DuckDB Federated Query Engine HTTP API"""
+
+    def __init__(self, base_url: str = "http://localhost:8080", timeout: int = 30,
+                 cache_ttl: float = 60, cache_maxsize: int = 256,
+                 compress_requests: bool = False,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize the async DuckDB FQE client
+
+        Args:
+            base_url: Base URL of the DuckDB HTTP server
+            timeout: Request timeout in seconds
+            cache_ttl: Lifetime in seconds of cached metadata/query results
+            cache_maxsize: Maximum number of cached results kept (LRU eviction)
+            compress_requests: Gzip large request bodies (the server must
+                accept Content-Encoding: gzip)
+            transport: Optional httpx transport, e.g. httpx.MockTransport in tests
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.compress_requests = compress_requests
+        self._cache = _TTLCache(cache_ttl, cache_maxsize)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        """The underlying HTTP client, which only exists inside 'async with'"""
+        if self._client is None:
+            raise RuntimeError("AsyncDuckDBFQEClient must be used as 'async with AsyncDuckDBFQEClient(...)'")
+        return self._client
+
+    async def is_healthy(self) -> bool:
+        """Check if the DuckDB service is healthy and responsive"""
+        try:
+            response = await self._http.get("/health", timeout=5)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def wait_for_ready(self, max_wait: int = 60) -> bool:
+        """
+        Wait for the DuckDB service to be ready
+
+        Args:
+            max_wait: Maximum time to wait in seconds
+
+        Returns:
+            True if service becomes ready, False if timeout
+        """
+        try:
+            return await asyncio.wait_for(self._probe(), timeout=max_wait)
+        except asyncio.TimeoutError:
+            return False
+
+    async def _probe(self) -> bool:
+        """Poll the health endpoint with exponential backoff until it responds"""
+        delay = READY_INITIAL_DELAY
+        while not await self.is_healthy():
+            await asyncio.sleep(delay)
+            delay = min(READY_MAX_DELAY, delay * 2)
+        return True
+
+    async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                            use_cache: bool = False) -> Dict[str, Any]:
+        """
+        Execute a SQL query
+
+        Args:
+            query: SQL query to execute
+            params: Optional query parameters
+            use_cache: Serve repeated read-only queries from the TTL cache
+
+        Returns:
+            Query results as dictionary
+
+        Raises:
+            Exception: If query execution fails
+        """
+        is_write = _WRITE_RE.match(query) is not None
+        key = None
+        if use_cache and not is_write:
+            key = _cache_key(query, params)
+            cached = self._cache.get(key)
+            if cached is not _MISSING:
+                # Raw response bytes are cached so every caller gets its own copy
+                return _json_loads(cached)
+
+        payload = {"query": query}
+        if params:
+            payload["params"] = params
+
+        try:
+            body, headers = _encode_body(payload, self.compress_requests)
+            response = await self._http.post("/query", content=body, headers=headers)
+
+            if response.status_code == 200:
+                result = _json_loads(response.content)
+                if key is not None:
+                    self._cache.set(key, response.content)
+                elif is_write:
+                    self._cache.clear()
+                return result
+            else:
+                raise Exception(f"Query failed with status {response.status_code}: {response.text}")
+
+        except httpx.HTTPError as e:
+            raise Exception(f"Request failed: {e}")
+
+    async def execute_queries(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Execute several independent SQL queries concurrently
+
+        Args:
+            queries: SQL queries to execute
+
+        Returns:
+            Query results, in the same order as the queries
+        """
+        return await asyncio.gather(*[self.execute_query(q) for q in queries])
+
+    async def get_databases(self) -> List[Dict[str, str]]:
+        """Get list of attached databases"""
+        return await self.execute_query("SHOW DATABASES", use_cache=True)
+
+    async def get_connection_info(self) -> Dict[str, Any]:
+        """Get information about the DuckDB connection and attached databases"""
+        info = {
+            "base_url": self.base_url,
+            "healthy": await self.is_healthy(),
+            "databases": None,
+            "version": None
+        }
+
+        try:
+            # Fetch version and attached databases in a single round trip
+            row = _first_row(await self.execute_query(CONNECTION_INFO_QUERY))
+            if row:
+                info["version"], info["databases"] = row
+
+        except Exception as e:
+            info["error"] = str(e)
+
+        return info
+
+    def invalidate_metadata(self):
+        """Drop cached metadata and query results, e.g. after out-of-band DDL"""
+        self._cache.clear()
+
+    async def close(self):
+        """Close the HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64,
+                                keepalive_expiry=60),
+            headers={"Content-Type": "application/json", "Accept-Encoding": ACCEPT_ENCODING},
+            transport=self._transport
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+
+
 # Example usage
 if __name__ == "__main__":
     # Example usage of the client
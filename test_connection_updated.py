@@ -4,47 +4,104 @@ Updated test script for DuckDB Federated Query Engine
 Tests HTTP API connectivity with actual TPC-DS data setup
 """
 
-import requests
+import asyncio
+import concurrent.futures
+import httpx
 import json
-import time
+from operator import itemgetter
 import sys
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _run_coroutine(coro_factory):
+    """
+    Run a coroutine to completion from synchronous code
+
+    asyncio.run() refuses to start while an event loop is already running in
+    this thread (notebooks, async applications), so in that case the
+    coroutine gets its own loop on a worker thread, blocking the caller.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro_factory())
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(lambda: asyncio.run(coro_factory())).result()
+
+
 class DuckDBFQETester:
     def __init__(self, base_url="http://localhost:8082"):
         self.base_url = base_url
-        self.session = requests.Session()
+        self._post_url = f"{base_url}/?add_http_cors_header=1&default_format=JSONCompact&max_result_rows=1000"
+        self._post_headers = {"Content-Type": "text/plain"}
+        self.client = httpx.Client(
+            timeout=None,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=32),
+            headers=self._post_headers
+        )
 
     def wait_for_service(self, timeout=60):
         """Wait for DuckDB HTTP service to be available"""
         print(f"Waiting for DuckDB service at {self.base_url}...")
-        start_time = time.time()
+        urls = [f"{self.base_url}/", f"{self.base_url}/health"]
 
-        while time.time() - start_time < timeout:
-            try:
-                response = self.session.get(f"{self.base_url}/")
-                if response.status_code == 200:
-                    print("✓ DuckDB service is ready")
-                    return True
-            except requests.exceptions.ConnectionError:
-                pass
+        async def _wait():
+            delay = 0.1
+            async with httpx.AsyncClient(timeout=5) as client:
+                while not await self._probe_round(client, urls):
+                    await asyncio.sleep(delay)
+                    delay = min(2.0, delay * 2)
 
-            time.sleep(2)
+        async def _wait_with_timeout():
+            await asyncio.wait_for(_wait(), timeout=timeout)
+
+        try:
+            _run_coroutine(_wait_with_timeout)
+            print("✓ DuckDB service is ready")
+            return True
+        except asyncio.TimeoutError:
+            pass
 
         print("✗ DuckDB service is not available")
         return False
 
+    async def _probe(self, client, url):
+        """Return True if url answers with HTTP 200"""
+        try:
+            response = await client.get(url)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def _probe_round(self, client, urls):
+        """Probe all urls concurrently, returning as soon as any one is up"""
+        tasks = [asyncio.ensure_future(self._probe(client, url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if await next_done:
+                    return True
+            return False
+        finally:
+            for task in tasks:
+                task.cancel()
+
     def execute_query(self, query):
         """Execute a SQL query via HTTP API"""
         try:
-            response = self.session.post(
-                f"{self.base_url}/?add_http_cors_header=1&default_format=JSONCompact&max_result_rows=1000",
-                data=query,
-                headers={"Content-Type": "text/plain"}
+            response = self.client.post(
+                self._post_url,
+                content=query
             )
 
             if response.status_code == 200:
                 try:
-                    return response.json()
+                    return _json_loads(response.content)
                 except:
                     return {"result": response.text}
             else:
@@ -55,6 +112,39 @@ class DuckDBFQETester:
             print(f"Error executing query: {e}")
             return None
 
+    async def _execute_query_async(self, client, query):
+        """Execute a SQL query via HTTP API on an httpx.AsyncClient"""
+        try:
+            response = await client.post(
+                self._post_url,
+                content=query,
+                headers=self._post_headers
+            )
+
+            if response.status_code == 200:
+                try:
+                    return _json_loads(response.content)
+                except ValueError:
+                    return {"result": response.text}
+            else:
+                print(f"Query failed with status {response.status_code}: {response.text}")
+                return None
+
+        except Exception as e:
+            print(f"Error executing query: {e}")
+            return None
+
+    def execute_queries(self, queries):
+        """Execute several SQL queries concurrently, returning results in order"""
+        async def _run():
+            limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            async with httpx.AsyncClient(http2=True, limits=limits, timeout=None) as client:
+                return await asyncio.gather(
+                    *[self._execute_query_async(client, q) for q in queries]
+                )
+
+        return _run_coroutine(_run)
+
     def setup_databases(self):
         """Check that databases are attached (they should auto-attach on startup)"""
         print("\n=== Checking Database Connections ===")
@@ -63,7 +153,7 @@ class DuckDBFQETester:
         current_dbs = self.execute_query("SHOW DATABASES")
         existing_dbs = []
         if current_dbs and 'data' in current_dbs:
-            existing_dbs = [row[0] for row in current_dbs['data']]
+            existing_dbs = list(map(itemgetter(0), current_dbs['data']))
 
         # Verify required databases are attached
         required_dbs = ['postgres', 'mysql', 'mariadb']
@@ -97,7 +187,7 @@ class DuckDBFQETester:
 
         result = self.execute_query("SHOW DATABASES")
         if result and 'data' in result:
-            databases = [row[0] for row in result['data']]
+            databases = list(map(itemgetter(0), result['data']))
             print("✓ SHOW DATABASES successful")
             print(f"Available databases: {databases}")
 
@@ -120,11 +210,31 @@ class DuckDBFQETester:
             ('mariadb', 'db1')
         ]
 
+        # Count every database in a single round trip, letting DuckDB format
+        # the counts with thousands separators
+        counts = " UNION ALL ".join([
+            f"SELECT '{db_name}' AS db, COUNT(*) AS cnt FROM {db_name}.{schema_name}.customer"
+            for db_name, schema_name in databases
+        ])
+        query = f"SELECT db, format('{{:,}}', cnt) AS customer_count FROM ({counts}) t"
+        result = self.execute_query(query)
+        if result and 'data' in result:
+            sys.stdout.write("".join(
+                f"✓ {db_name}: {count} customers\n" for db_name, count in result['data']
+            ))
+            return len(result['data']) >= 1
+
+        # One unreachable database fails the whole UNION, so fall back to
+        # counting each database separately
+        queries = [
+            f"SELECT COUNT(*) as customer_count FROM {db_name}.{schema_name}.customer"
+            for db_name, schema_name in databases
+        ]
+        results = self.execute_queries(queries)
+
         success_count = 0
-        for db_name, schema_name in databases:
+        for (db_name, _), result in zip(databases, results):
             try:
-                query = f"SELECT COUNT(*) as customer_count FROM {db_name}.{schema_name}.customer"
-                result = self.execute_query(query)
                 if result and 'data' in result:
                     count = result['data'][0][0]
                     print(f"✓ {db_name}: {count:,} customers")
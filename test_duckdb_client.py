@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the DuckDB FQE Python client
+Exercise the client against an in-process httpx.MockTransport, no server needed
+"""
+
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+import duckdb_client
+from duckdb_client import AsyncDuckDBFQEClient, DuckDBFQEClient
+
+
+class FakeServer:
+    """Records the SQL sent to /query and answers through a handler function"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.queries = []
+
+    def __call__(self, request):
+        if request.url.path == "/health":
+            return httpx.Response(200)
+        body = request.content
+        if request.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        self.queries.append(payload["query"])
+        return self.handler(request, payload)
+
+
+def json_result(data, columns=("value",)):
+    return httpx.Response(200, json={"columns": list(columns), "data": data})
+
+
+def echo_query(request, payload):
+    return json_result([[payload["query"]]])
+
+
+def make_client(handler, **kwargs):
+    server = FakeServer(handler)
+    client = DuckDBFQEClient("http://fqe", transport=httpx.MockTransport(server), **kwargs)
+    return client, server
+
+
+# --- Async client and concurrent fan-out -------------------------------------
+
+def test_async_client_requires_context_manager():
+    async def run():
+        await AsyncDuckDBFQEClient("http://fqe").execute_query("SELECT 1")
+
+    with pytest.raises(RuntimeError, match="async with"):
+        asyncio.run(run())
+
+
+def test_async_client_fans_out_queries():
+    server = FakeServer(echo_query)
+
+    async def run():
+        async with AsyncDuckDBFQEClient("http://fqe", transport=httpx.MockTransport(server)) as client:
+            return await client.execute_queries(["SELECT 1", "SELECT 2"])
+
+    results = asyncio.run(run())
+    assert [r["data"][0][0] for r in results] == ["SELECT 1", "SELECT 2"]
+
+
+def test_sync_execute_queries_reuses_one_async_client():
+    client, server = make_client(echo_query)
+    try:
+        first = client.execute_queries(["SELECT 1", "SELECT 2"])
+        async_client = client._async_client
+        second = client.execute_queries(["SELECT 3"])
+
+        assert [r["data"][0][0] for r in first + second] == ["SELECT 1", "SELECT 2", "SELECT 3"]
+        assert client._async_client is async_client
+        assert sorted(server.queries) == ["SELECT 1", "SELECT 2", "SELECT 3"]
+    finally:
+        client.close()
+    assert client._loop is None
+
+
+def test_sync_execute_queries_works_inside_running_loop():
+    client, server = make_client(echo_query)
+
+    async def run():
+        return client.execute_queries(["SELECT 1"])
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        client.close()
+    assert results[0]["data"] == [["SELECT 1"]]
+
+
+# --- Connection info ---------------------------------------------------------
+
+@pytest.mark.parametrize("result, row", [
+    ({"columns": ["a", "b"], "data": [[1, 2], [3, 4]]}, [1, 2]),
+    ([{"a": 1, "b": 2}], [1, 2]),
+    ({"columns": ["a"], "data": []}, None),
+    ([], None),
+])
+def test_first_row_handles_both_result_shapes(result, row):
+    assert duckdb_client._first_row(result) == row
+
+
+def test_connection_info_uses_one_query():
+    client, server = make_client(
+        lambda request, payload: json_result([["v1.3.2", ["postgres", "mysql"]]],
+                                             columns=("version", "databases"))
+    )
+
+    info = client.get_connection_info()
+
+    assert info == {
+        "base_url": "http://fqe",
+        "healthy": True,
+        "databases": ["postgres", "mysql"],
+        "version": "v1.3.2",
+    }
+    assert server.queries == [duckdb_client.CONNECTION_INFO_QUERY]
+    assert "WHERE NOT internal" in duckdb_client.CONNECTION_INFO_QUERY
+
+
+def test_connection_info_reports_errors():
+    client, server = make_client(lambda request, payload: httpx.Response(500, text="boom"))
+
+    info = client.get_connection_info()
+
+    assert info["version"] is None and info["databases"] is None
+    assert "boom" in info["error"]
+
+
+# --- Metadata cache ----------------------------------------------------------
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = duckdb_client._TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is duckdb_client._MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(duckdb_client.time, "monotonic", lambda: now[0])
+    cache = duckdb_client._TTLCache(ttl=10)
+    cache.set("a", 1)
+
+    now[0] = 109.0
+    assert cache.get("a") == 1
+    now[0] = 111.0
+    assert cache.get("a") is duckdb_client._MISSING
+
+
+def test_cached_results_are_not_shared_between_callers():
+    client, server = make_client(lambda request, payload: json_result([["postgres"]]))
+
+    first = client.get_databases()
+    first["data"].append(["mutated"])
+    second = client.get_databases()
+
+    assert second["data"] == [["postgres"]]
+    assert server.queries == ["SHOW DATABASES"]
+
+
+@pytest.mark.parametrize("statement", [
+    "CREATE TABLE t (x INT)",
+    "  drop table t",
+    "ALTER TABLE t ADD COLUMN y INT",
+    "DETACH mysql",
+    "USE postgres",
+    "COPY t TO 'out.csv'",
+])
+def test_write_statement_clears_cache(statement):
+    client, server = make_client(lambda request, payload: json_result([["postgres"]]))
+
+    client.get_databases()
+    client.execute_query(statement)
+    client.get_databases()
+
+    assert server.queries == ["SHOW DATABASES", statement, "SHOW DATABASES"]
+
+
+def test_dataframe_write_clears_cache():
+    client, server = make_client(lambda request, payload: json_result([]))
+
+    client.get_databases()
+    client.execute_query_to_dataframe("DROP TABLE x")
+    client.get_databases()
+
+    assert server.queries == ["SHOW DATABASES", "DROP TABLE x", "SHOW DATABASES"]
+
+
+# --- Arrow results -----------------------------------------------------------
+
+@pytest.fixture
+def arrow_enabled(monkeypatch):
+    # The fallback paths never decode Arrow, so pyarrow itself is not needed
+    if duckdb_client.pa is None:
+        monkeypatch.setattr(duckdb_client, "pa", object())
+
+
+def test_arrow_stream_is_decoded_into_typed_columns():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({
+        "id": pa.array([1, 2, 3], type=pa.int64()),
+        "name": pa.array(["a", "b", "c"]),
+        "score": pa.array([1.5, 2.5, None], type=pa.float64()),
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    stream = sink.getvalue().to_pybytes()
+
+    def handler(request, payload):
+        assert request.url.params["default_format"] == "ArrowStream"
+        assert request.headers["Accept"] == duckdb_client.ARROW_STREAM_MIME
+        assert "format" not in payload
+        return httpx.Response(200, content=stream,
+                              headers={"Content-Type": duckdb_client.ARROW_STREAM_MIME})
+
+    client, server = make_client(handler)
+    df = client.execute_query_to_dataframe("SELECT * FROM t")
+
+    assert str(df["id"].dtype) == "int64"
+    assert str(df["score"].dtype) == "float64"
+    assert df["id"].tolist() == [1, 2, 3]
+    assert df["name"].tolist() == ["a", "b", "c"]
+    assert df["score"].isna().tolist() == [False, False, True]
+    assert client._arrow_supported is True
+
+
+@pytest.mark.parametrize("body", [
+    "Catalog Error: Table nope does not exist",
+    "Catalog Error: Table ArrowStream does not exist",
+])
+def test_arrow_query_error_raises_and_keeps_arrow(arrow_enabled, body):
+    client, server = make_client(lambda request, payload: httpx.Response(400, text=body))
+
+    with pytest.raises(Exception, match="Query failed with status 400"):
+        client.execute_query_to_dataframe("SELECT * FROM nope")
+    assert client._arrow_supported is True
+    assert len(server.queries) == 1
+
+
+@pytest.mark.parametrize("status, body", [
+    (415, "Unsupported Media Type"),
+    (400, "Unknown format: ArrowStream"),
+])
+def test_arrow_rejected_format_falls_back_to_json(arrow_enabled, status, body):
+    def handler(request, payload):
+        if request.headers.get("Accept") == duckdb_client.ARROW_STREAM_MIME:
+            return httpx.Response(status, text=body)
+        return json_result([[1], [2]])
+
+    client, server = make_client(handler)
+
+    df = client.execute_query_to_dataframe("SELECT 1")
+    assert df["value"].tolist() == [1, 2]
+    assert client._arrow_supported is False
+
+    server.queries.clear()
+    client.execute_query_to_dataframe("SELECT 1")
+    assert len(server.queries) == 1
+
+
+def test_arrow_json_answer_is_used_without_second_request(arrow_enabled):
+    client, server = make_client(lambda request, payload: json_result([[3]]))
+
+    df = client.execute_query_to_dataframe("SELECT 3")
+    assert df["value"].tolist() == [3]
+    assert len(server.queries) == 1
+    assert client._arrow_supported is False
+
+
+# --- Prepared statements -----------------------------------------------------
+
+def test_prepared_statements_are_reused_when_server_keeps_them():
+    prepared = set()
+
+    def handler(request, payload):
+        query = payload["query"]
+        if query.startswith("PREPARE "):
+            prepared.add(query.split()[1])
+            return json_result([])
+        if query.startswith("EXECUTE "):
+            assert query.split()[1] in prepared
+        return json_result([[42]], columns=("count",))
+
+    client, server = make_client(handler)
+
+    assert [client.count_rows("postgres.public.customer") for _ in range(3)] == [42, 42, 42]
+    assert server.queries == [
+        "SELECT COUNT(*) as count FROM postgres.public.customer",
+        "PREPARE fqe_stmt_0 AS SELECT COUNT(*) as count FROM postgres.public.customer",
+        "EXECUTE fqe_stmt_0",
+        "EXECUTE fqe_stmt_0",
+    ]
+
+
+def test_prepared_statements_fall_back_when_server_forgets_them():
+    def handler(request, payload):
+        query = payload["query"]
+        if query.startswith("EXECUTE "):
+            name = query.split()[1]
+            return httpx.Response(400, text=f'Binder Error: Prepared statement "{name}" does not exist')
+        if query.startswith("PREPARE "):
+            return json_result([])
+        return json_result([[7]], columns=("count",))
+
+    client, server = make_client(handler)
+    table = "mysql.db1.customer"
+
+    assert client.count_rows(table) == 7
+    assert client.count_rows(table) == 7
+    assert client._prepare_supported is False
+    server.queries.clear()
+
+    assert client.count_rows(table) == 7
+    assert server.queries == ["SELECT COUNT(*) as count FROM mysql.db1.customer"]
+
+
+def test_prepared_statements_fall_back_when_server_rejects_prepare():
+    def handler(request, payload):
+        if payload["query"].startswith("PREPARE "):
+            return httpx.Response(400, text="Permission Error: cannot prepare statements")
+        return json_result([[5]], columns=("count",))
+
+    client, server = make_client(handler)
+
+    assert [client.count_rows("postgres.public.customer") for _ in range(3)] == [5, 5, 5]
+    assert client._prepare_supported is False
+    assert sum(q.startswith("PREPARE ") for q in server.queries) == 1
+
+
+def test_prepared_statement_sql_errors_are_not_retried():
+    dropped = [False]
+
+    def handler(request, payload):
+        if dropped[0] and payload["query"].startswith("EXECUTE "):
+            return httpx.Response(400, text="Catalog Error: Table customer does not exist")
+        return json_result([[1]], columns=("count",))
+
+    client, server = make_client(handler)
+    client.count_rows("postgres.public.customer")
+    client.count_rows("postgres.public.customer")
+    dropped[0] = True
+    server.queries.clear()
+
+    with pytest.raises(Exception, match="Catalog Error"):
+        client.count_rows("postgres.public.customer")
+    assert server.queries == ["EXECUTE fqe_stmt_0"]
+
+
+def test_prepared_statement_tracking_is_bounded(monkeypatch):
+    monkeypatch.setattr(duckdb_client, "PREPARED_MAXSIZE", 2)
+    client, server = make_client(lambda request, payload: json_result([[1]], columns=("count",)))
+
+    client.count_rows("t1")
+    client.count_rows("t1")
+    client.count_rows("t2")
+    client.count_rows("t3")
+
+    assert list(client._prepared) == [duckdb_client._count_sql("t2"), duckdb_client._count_sql("t3")]
+    assert "DEALLOCATE fqe_stmt_0" in server.queries
+
+
+# --- Readiness backoff -------------------------------------------------------
+
+def health_transport(failures):
+    """Transport whose /health answers 503 for the first `failures` probes"""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(503 if len(calls) <= failures else 200)
+
+    return httpx.MockTransport(handler), calls
+
+
+def test_wait_for_ready_backs_off_exponentially(monkeypatch):
+    now = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(duckdb_client.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(duckdb_client.time, "sleep", fake_sleep)
+    transport, calls = health_transport(failures=6)
+    client = DuckDBFQEClient("http://fqe", transport=transport)
+
+    assert client.wait_for_ready(max_wait=60) is True
+    assert sleeps == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.6, 2.0])
+    assert len(calls) == 7
+
+
+def test_wait_for_ready_never_sleeps_past_deadline(monkeypatch):
+    now = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(duckdb_client.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(duckdb_client.time, "sleep", fake_sleep)
+    transport, calls = health_transport(failures=1000)
+    client = DuckDBFQEClient("http://fqe", transport=transport)
+
+    assert client.wait_for_ready(max_wait=1) is False
+    assert sleeps == pytest.approx([0.1, 0.2, 0.4, 0.3])
+    assert now[0] == pytest.approx(1.0)
+
+
+def test_async_probe_backs_off_exponentially(monkeypatch):
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(duckdb_client.asyncio, "sleep", fake_sleep)
+    transport, calls = health_transport(failures=3)
+
+    async def run():
+        async with AsyncDuckDBFQEClient("http://fqe", transport=transport) as client:
+            return await client.wait_for_ready(max_wait=5)
+
+    assert asyncio.run(run()) is True
+    assert sleeps == pytest.approx([0.1, 0.2, 0.4])
+
+
+# --- Batches -----------------------------------------------------------------
+
+def test_batch_returns_one_result_per_statement():
+    results = [{"columns": ["v"], "data": [[1]]}, {"columns": ["v"], "data": [[2]]}]
+
+    def handler(request, payload):
+        assert payload["multi_statement"] == 1
+        return httpx.Response(200, json={"results": results})
+
+    client, server = make_client(handler)
+
+    assert client.execute_batch(["SELECT 1", "SELECT 2"]) == results
+    assert server.queries == ["SELECT 1; SELECT 2"]
+
+
+def test_batch_with_writes_is_rejected_before_sending():
+    client, server = make_client(lambda request, payload: json_result([]))
+
+    with pytest.raises(ValueError):
+        client.execute_batch(["SELECT 1", "DELETE FROM t"])
+    assert server.queries == []
+
+
+def test_batch_without_result_sets_is_not_replayed():
+    client, server = make_client(lambda request, payload: json_result([[2]]))
+
+    with pytest.raises(Exception, match="multi-statement"):
+        client.execute_batch(["SELECT 1", "SELECT 2"])
+    assert client._batch_supported is False
+
+    with pytest.raises(Exception, match="multi-statement"):
+        client.execute_batch(["SELECT 1", "SELECT 2"])
+    assert server.queries == ["SELECT 1; SELECT 2"]
+
+
+# --- JSON encoding -----------------------------------------------------------
+
+def test_payload_is_pre_encoded_json_bytes():
+    bodies = []
+
+    def handler(request, payload):
+        bodies.append(request.content)
+        assert request.headers["Content-Type"] == "application/json"
+        return json_result([])
+
+    client, server = make_client(handler)
+    client.execute_query("SELECT $1", params={"1": "é"})
+
+    assert bodies == [duckdb_client._json_dumps({"query": "SELECT $1", "params": {"1": "é"}})]
+    assert json.loads(bodies[0]) == {"query": "SELECT $1", "params": {"1": "é"}}
+
+
+def test_orjson_is_used_when_available():
+    orjson = pytest.importorskip("orjson")
+    assert duckdb_client._json_dumps is orjson.dumps
+    assert duckdb_client._json_loads is orjson.loads
+
+
+def test_stdlib_json_fallback_without_orjson(monkeypatch):
+    import importlib.util
+    import sys
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    spec = importlib.util.spec_from_file_location("duckdb_client_no_orjson", duckdb_client.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert module._json_dumps({"query": "SELECT 1"}) == b'{"query": "SELECT 1"}'
+    assert module._json_loads(b'{"data": [[1]]}') == {"data": [[1]]}
+
+
+# --- Compression -------------------------------------------------------------
+
+def capture_requests():
+    seen = []
+
+    def handler(request, payload):
+        seen.append(request)
+        return json_result([])
+
+    return handler, seen
+
+
+def test_accept_encoding_advertises_gzip_and_zstd():
+    handler, seen = capture_requests()
+    client, server = make_client(handler)
+    client.execute_query("SELECT 1")
+    assert seen[0].headers["Accept-Encoding"] == "gzip, zstd"
+
+
+def test_large_bodies_are_gzipped_when_enabled():
+    handler, seen = capture_requests()
+    client, server = make_client(handler, compress_requests=True)
+    query = "SELECT " + ", ".join(f"c{i}" for i in range(2000)) + " FROM t"
+
+    client.execute_query(query)
+
+    request = seen[0]
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert len(duckdb_client._json_dumps({"query": query})) > duckdb_client.COMPRESS_MIN_BYTES
+    assert json.loads(gzip.decompress(request.content)) == {"query": query}
+    assert server.queries == [query]
+
+
+@pytest.mark.parametrize("compress, query", [
+    (True, "SELECT 1"),
+    (False, "SELECT " + "x, " * 3000 + "1"),
+])
+def test_bodies_are_sent_plain_when_small_or_disabled(compress, query):
+    handler, seen = capture_requests()
+    client, server = make_client(handler, compress_requests=compress)
+
+    client.execute_query(query)
+
+    assert "Content-Encoding" not in seen[0].headers
+    assert json.loads(seen[0].content) == {"query": query}
+
+
+def test_async_client_gzips_large_bodies():
+    handler, seen = capture_requests()
+    server = FakeServer(handler)
+    query = "SELECT " + "x, " * 3000 + "1"
+
+    async def run():
+        async with AsyncDuckDBFQEClient("http://fqe", compress_requests=True,
+                                        transport=httpx.MockTransport(server)) as client:
+            await client.execute_query(query)
+
+    asyncio.run(run())
+    assert seen[0].headers["Content-Encoding"] == "gzip"
+    assert server.queries == [query]
+
+
+# --- Identifier validation ---------------------------------------------------
+
+@pytest.mark.parametrize("name", [
+    "customer",
+    "postgres.public.customer",
+    'postgres.public."Customer"',
+    '"my ""odd"" db".public.customer',
+])
+def test_describe_table_accepts_identifiers(name):
+    client, server = make_client(lambda request, payload: json_result([]))
+    client.describe_table(name)
+    assert server.queries == [f"DESCRIBE {name}"]
+
+
+def test_table_names_are_canonicalized():
+    client, server = make_client(lambda request, payload: json_result([[3]], columns=("count",)))
+    assert client.count_rows("  postgres.public.customer ") == 3
+    assert server.queries == ["SELECT COUNT(*) as count FROM postgres.public.customer"]
+
+
+@pytest.mark.parametrize("name", [
+    "a.b.c.d",
+    "customer; DROP TABLE customer",
+    '"customer"; DROP TABLE x',
+    "1customer",
+    '"unterminated',
+])
+def test_invalid_table_names_are_rejected(name):
+    client, server = make_client(lambda request, payload: json_result([]))
+    with pytest.raises(ValueError):
+        client.describe_table(name)
+    with pytest.raises(ValueError):
+        client.count_rows(name)
+    assert server.queries == []